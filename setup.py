@@ -14,7 +14,8 @@ setup(name='turco',
             'console_scripts': ['turco-init=turco.command_line:init',
                                 'turco-create-questions=turco.command_line:create_questions',
                                 'turco-publish-questions=turco.command_line:publish_questions',
-                                'turco-retrieve-questions=turco.command_line:retrieve_questions'
+                                'turco-retrieve-questions=turco.command_line:retrieve_questions',
+                                'turco-campaign=turco.command_line:run_campaign'
                                 ]
             }
       )
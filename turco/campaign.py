@@ -0,0 +1,305 @@
+import os
+import json
+import time
+import boto3
+import datetime
+import threading
+import traceback
+from botocore.config import Config
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from .core import MTurkHelper, load_args, mturk_endpoint
+
+ACTIONS = ["create", "publish", "retrieve"]
+MANIFEST_KEYS = {"rate": (int, float), "workers": (int,), "alter_names": (bool,)}
+
+
+class RequestBudget(object):
+
+    def __init__(self, rate, burst=None):
+        """ Token bucket shared by every project of a campaign, so that all of them together stay within the account's
+        MTurk request limits.
+
+        :param rate: Float. Requests per second allowed across the whole campaign.
+        :param burst: Integer. How many requests may be issued back to back. Defaults to `rate`, but at least 1.
+        """
+
+        if rate <= 0:
+            raise Exception("Rate must be greater than 0 (got {0}).".format(rate))
+
+        if burst is not None and burst < 1:
+            raise Exception("Burst must be at least 1 (got {0}).".format(burst))
+
+        self.rate = float(rate)
+        self.burst = float(burst if burst is not None else max(rate, 1))
+        self.tokens = self.burst
+        self.last = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """ Blocks until a request can be issued.
+
+        :return: Nothing.
+        """
+
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.last) * self.rate)
+                self.last = now
+
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+
+                wait = (1 - self.tokens) / self.rate
+
+            time.sleep(wait)
+
+
+class BudgetedClient(object):
+
+    def __init__(self, get_client, budget):
+        """ Wraps a (shared) boto3 client so that every API call first takes a token from the campaign budget. It also
+        counts the calls issued through it, which is used for the per-project progress reports. Paginators and waiters
+        are handed out as they are, so the calls they make bypass the budget and are not counted.
+
+        The client is only fetched on first use, so that errors getting it (e.g. a broken `secrets.json`) happen while
+        the project runs and end up in its log.
+
+        :param get_client: Function. Returns the boto3 client.
+        :param budget: RequestBudget. If None, calls are not throttled.
+        """
+
+        self.get_client = get_client
+        self.client = None
+        self.budget = budget
+        self.calls = 0
+
+    def __getattr__(self, name):
+        if self.client is None:
+            self.client = self.get_client()
+
+        attr = getattr(self.client, name)
+
+        if not callable(attr) or name.startswith("_") or name in ("can_paginate", "get_paginator", "get_waiter"):
+            return attr
+
+        def call(*args, **kwargs):
+            if self.budget is not None:
+                self.budget.acquire()
+            self.calls += 1
+            return attr(*args, **kwargs)
+
+        return call
+
+
+class ClientPool(object):
+
+    def __init__(self, max_pool_connections=10):
+        """ Builds boto3 clients once per (service, credentials, endpoint) and hands the same client to every project
+        using the same account, so they share a single connection pool.
+
+        :param max_pool_connections: Integer. Size of the connection pool of each client.
+        """
+
+        self.config = Config(max_pool_connections=max_pool_connections)
+        self.clients = dict()
+        self.lock = threading.Lock()
+
+    def get(self, service, secrets_path, endpoint=None):
+        """ Returns the client for the given service, creating it if needed.
+
+        :param service: String. "mturk" or "sqs".
+        :param secrets_path: String. Path to the project's `secrets.json`.
+        :param endpoint: String. Endpoint url, if any.
+        :return: boto3 client.
+        """
+
+        with open(secrets_path, "r") as f:
+            secrets = json.load(f)
+
+        key = (service, secrets["access_key"], secrets["secret_key"], endpoint)
+
+        # boto3 clients are thread safe, but creating them is not
+        with self.lock:
+            if key not in self.clients:
+                self.clients[key] = boto3.client(service,
+                                                 aws_access_key_id=secrets["access_key"],
+                                                 aws_secret_access_key=secrets["secret_key"],
+                                                 region_name='us-east-1',
+                                                 endpoint_url=endpoint,
+                                                 config=self.config)
+            return self.clients[key]
+
+
+class CampaignRunner(object):
+
+    def __init__(self, paths, pay=False, rate=5, workers=4, alter_names=False):
+        """ Drives create/publish/retrieve for many turco projects in a single process.
+
+        :param paths: List. Project directories, as created by `turco-init`. Duplicates are only run once.
+        :param pay: Boolean. Whether to use real money for all projects.
+        :param rate: Float. Requests per second allowed across all projects. If None, requests are not throttled.
+        :param workers: Integer. How many projects are processed at the same time.
+        :param alter_names: Boolean. Passed to `MTurkHelper.publish_questions`.
+        """
+
+        if workers < 1:
+            raise Exception("Workers must be at least 1 (got {0}).".format(workers))
+
+        self.paths = []
+        for path in paths:
+            path = os.path.abspath(path)
+            if path not in self.paths:
+                self.paths.append(path)
+
+        # Projects are labeled by their path relative to the common parent of all of them, so that labels are unique
+        parent = os.path.commonpath([os.path.dirname(path) for path in self.paths]) if self.paths else ""
+        self.labels = {path: os.path.relpath(path, parent) for path in self.paths}
+
+        self.pay = pay
+        self.workers = workers
+        self.alter_names = alter_names
+        self.budget = RequestBudget(rate) if rate is not None else None
+        self.pool = ClientPool(max_pool_connections=max(workers, 10))
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def load_manifest(manifest_path):
+        """ Reads a campaign manifest, a json file of the form {"projects": ["my-hit", ...]} which may also set "rate",
+        "workers" and "alter_names". Relative project paths are taken relative to the manifest, other keys are ignored.
+        Real money can't be set here, only with `-pay`.
+
+        :param manifest_path: String. Path to the manifest.
+        :return: Dictionary. Keyword arguments for `CampaignRunner`.
+        """
+
+        if not os.path.exists(manifest_path):
+            raise Exception("{0} does not exist!".format(manifest_path))
+
+        with open(manifest_path, "r") as f:
+            manifest = json.load(f)
+
+        if not isinstance(manifest, dict) or not isinstance(manifest.get("projects"), list):
+            raise Exception("{0} must have a \"projects\" list!".format(manifest_path))
+
+        if not all(isinstance(p, str) for p in manifest["projects"]):
+            raise Exception("{0}: \"projects\" must only contain paths!".format(manifest_path))
+
+        campaign_args = dict()
+
+        for key, types in MANIFEST_KEYS.items():
+            if key not in manifest:
+                continue
+
+            # bool is a subclass of int, so it has to be ruled out explicitly
+            if not isinstance(manifest[key], types) or (bool not in types and isinstance(manifest[key], bool)):
+                raise Exception("{0}: \"{1}\" must be {2}, got {3}!".format(
+                    manifest_path, key, " or ".join(t.__name__ for t in types), json.dumps(manifest[key])))
+
+            campaign_args[key] = manifest[key]
+
+        directory = os.path.dirname(os.path.abspath(manifest_path))
+        campaign_args["paths"] = [os.path.join(directory, p) for p in manifest["projects"]]
+
+        return campaign_args
+
+    def report(self, path, message):
+        """ Prints a progress message for a project.
+
+        :param path: String. Project directory.
+        :param message: String. Message to be printed.
+        :return: Nothing.
+        """
+
+        with self.lock:
+            print("[{0}] {1} {2}".format(datetime.datetime.now().strftime("%H:%M:%S"),
+                                         self.labels[path], message))
+
+    def make_helper(self, path):
+        """ Builds the `MTurkHelper` of a project on top of the shared clients.
+
+        :param path: String. Project directory.
+        :return: MTurkHelper.
+        """
+
+        default_args = load_args(path)
+        default_args["pay"] = self.pay
+        default_args["also_print"] = False
+
+        secrets_path = default_args["secrets_path"]
+
+        mturk = BudgetedClient(lambda: self.pool.get("mturk", secrets_path, mturk_endpoint(self.pay)), self.budget)
+        sqs = None
+
+        # The budget is about the MTurk limits only, so SQS polling is not throttled
+        if default_args.get("queue_url") is not None:
+            sqs = BudgetedClient(lambda: self.pool.get("sqs", secrets_path), None)
+
+        # Messages the helper always prints (e.g. HIT links) go through `report`, prefixed with the project
+        return MTurkHelper(mturk=mturk, sqs=sqs, printer=lambda message: self.report(path, message), **default_args)
+
+    def run_project(self, path, actions):
+        """ Runs the given actions, in order, for a single project. If one fails, its traceback goes to the project log.
+
+        :param path: String. Project directory.
+        :param actions: List. Subset of `ACTIONS`.
+        :return: Integer. Number of requests issued to MTurk.
+        """
+
+        mturk_helper = self.make_helper(path)
+
+        try:
+            for idx, action in enumerate(actions):
+                self.report(path, "{0} ({1}/{2})...".format(action, idx + 1, len(actions)))
+
+                if action == "create":
+                    mturk_helper.create_questions()
+                elif action == "publish":
+                    mturk_helper.publish_questions(alter_names=self.alter_names)
+                elif action == "retrieve":
+                    mturk_helper.get_replies()
+                else:
+                    raise Exception("Unknown action {0}!".format(action))
+        except Exception:
+            mturk_helper.log_append(traceback.format_exc())
+            raise
+
+        return mturk_helper.mturk.calls
+
+    def run(self, actions):
+        """ Runs the given actions for all projects, `self.workers` projects at a time. A failing project is reported
+        and does not stop the others.
+
+        :param actions: List. Subset of `ACTIONS`, run in the given order for every project.
+        :return: Dictionary. Maps each project directory to None if it succeeded, or to the exception raised.
+        """
+
+        for action in actions:
+            if action not in ACTIONS:
+                raise Exception("Unknown action {0}!".format(action))
+
+        if len(set(actions)) != len(actions):
+            raise Exception("Actions must not be repeated ({0}).".format(" ".join(actions)))
+
+        results = dict()
+        finished = 0
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            futures = {executor.submit(self.run_project, path, actions): path for path in self.paths}
+
+            for future in as_completed(futures):
+                path = futures[future]
+
+                try:
+                    calls = future.result()
+                    results[path] = None
+                    message = "done, {0} requests".format(calls)
+                except Exception as e:
+                    results[path] = e
+                    message = "failed: {0}: {1} (see log.txt)".format(type(e).__name__, e)
+
+                finished += 1
+                self.report(path, "{0} ({1}/{2} projects finished)".format(message, finished, len(self.paths)))
+
+        return results
@@ -1,27 +1,12 @@
 # from .core import *
 from shutil import copyfile
 from turco import package_directory
-from .core import MTurkHelper
+from .core import MTurkHelper, load_args
+from .campaign import CampaignRunner, ACTIONS
 import argparse
 import json
 import os
 
-""" ============
-|   Helpers   
-============ """
-
-
-def load_args(path):
-    default_args = os.path.join(path, "default_args.json")
-
-    if not os.path.exists(default_args):
-        raise Exception("{0} does not exist!".format(default_args))
-
-    with open(default_args, "r") as f:
-        args = json.load(f)
-    return args
-
-
 """ ============
 |   Commands   
 ============ """
@@ -129,3 +114,36 @@ def retrieve_questions():
     default_args["pay"] = args.pay
     mturk_helper = MTurkHelper(**default_args)
     mturk_helper.get_replies()
+
+
+def run_campaign():
+    parser = argparse.ArgumentParser(prog='campaign')
+    parser.add_argument('-p', nargs='+', default=[], help='paths of the projects')
+    parser.add_argument('-m', help='path to a campaign manifest (json with a "projects" list)')
+    parser.add_argument('-a', nargs='+', required=True, choices=ACTIONS, help='actions to run, in order')
+    parser.add_argument("-pay", help="pay real money", action="store_true")
+    parser.add_argument("-alternames", help="alter names, splitting hits on the web interface", action="store_true")
+    parser.add_argument('-rate', type=float, help='max requests per second across all projects (default: 5)')
+    parser.add_argument('-workers', type=int, help='projects processed at the same time (default: 4)')
+    args = parser.parse_args()
+
+    campaign_args = CampaignRunner.load_manifest(args.m) if args.m is not None else {"paths": []}
+    campaign_args["paths"] += args.p
+
+    if len(campaign_args["paths"]) == 0:
+        raise Exception("No projects given, use -p and/or -m.")
+
+    campaign_args["pay"] = args.pay
+
+    if args.alternames:
+        campaign_args["alter_names"] = True
+    if args.rate is not None:
+        campaign_args["rate"] = args.rate
+    if args.workers is not None:
+        campaign_args["workers"] = args.workers
+
+    runner = CampaignRunner(**campaign_args)
+    results = runner.run(args.a)
+
+    if any(e is not None for e in results.values()):
+        raise SystemExit(1)
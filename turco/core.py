@@ -7,11 +7,39 @@ import datetime
 import pandas as pd
 
 
+def load_args(path):
+    """ Loads the `default_args.json` of a project created by `turco-init`.
+
+    :param path: String. Project directory.
+    :return: Dictionary. Keyword arguments for `MTurkHelper`.
+    """
+
+    default_args = os.path.join(path, "default_args.json")
+
+    if not os.path.exists(default_args):
+        raise Exception("{0} does not exist!".format(default_args))
+
+    with open(default_args, "r") as f:
+        args = json.load(f)
+    return args
+
+
+def mturk_endpoint(pay):
+    """ Returns the MTurk endpoint, production if we're using real money, sandbox otherwise.
+
+    :param pay: Boolean. Whether we're using real money.
+    :return: String. Endpoint url.
+    """
+
+    return "https://mturk-requester.us-east-1.amazonaws.com" if pay else \
+           'https://mturk-requester-sandbox.us-east-1.amazonaws.com'
+
+
 class MTurkHelper(object):
 
     def __init__(self, pay, config_path, secrets_path, template_path, logs_path, xml,
                  control_qualifications_path, qualification_folder_path, src_folder_path, xml_folder_path,
-                 out_folder_path, queue_url=None, also_print=True):
+                 out_folder_path, queue_url=None, also_print=True, mturk=None, sqs=None, printer=print):
 
         self.pay = pay
         self.config_path = config_path
@@ -25,23 +53,28 @@ class MTurkHelper(object):
         self.control_qualifications_path = control_qualifications_path
         self.queue_url = queue_url
         self.also_print = also_print
-        with open(secrets_path, "r") as f:
-            secrets = json.load(f)
+        self.printer = printer
+
+        # Clients may be handed in already built (e.g. shared across projects by `turco.campaign.ClientPool`)
+        self.mturk = mturk
+        self.sqs = sqs
 
-        endpoint = "https://mturk-requester.us-east-1.amazonaws.com" if pay else \
-                    'https://mturk-requester-sandbox.us-east-1.amazonaws.com'
+        if mturk is None or (sqs is None and queue_url is not None):
+            with open(secrets_path, "r") as f:
+                secrets = json.load(f)
 
-        self.mturk = boto3.client('mturk',
-                                  aws_access_key_id=secrets["access_key"],
-                                  aws_secret_access_key=secrets["secret_key"],
-                                  region_name='us-east-1',
-                                  endpoint_url=endpoint)
+            if mturk is None:
+                self.mturk = boto3.client('mturk',
+                                          aws_access_key_id=secrets["access_key"],
+                                          aws_secret_access_key=secrets["secret_key"],
+                                          region_name='us-east-1',
+                                          endpoint_url=mturk_endpoint(pay))
 
-        if queue_url is not None:
-            self.sqs = boto3.client('sqs',
-                                    aws_access_key_id=secrets["access_key"],
-                                    aws_secret_access_key=secrets["secret_key"],
-                                    region_name='us-east-1')
+            if sqs is None and queue_url is not None:
+                self.sqs = boto3.client('sqs',
+                                        aws_access_key_id=secrets["access_key"],
+                                        aws_secret_access_key=secrets["secret_key"],
+                                        region_name='us-east-1')
 
     """ ==========
     |   Helpers
@@ -59,7 +92,7 @@ class MTurkHelper(object):
             f.write(message + "\n")
             f.write("-" * 25 + "\n")
             if also_print:
-                print(message)
+                self.printer(message)
 
     def get_qualification_args(self, qualifications_path):
         """ Utility function which obtains the qualification arguments, which are different depending if we're using